@@ -3,7 +3,10 @@ import os
 import json
 import re
 import asyncio
+import hashlib
+import heapq
 import logging
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from datetime import datetime, timedelta, timezone
 
 
@@ -12,6 +15,11 @@ from discord.ext import commands
 from discord import app_commands 
 from dotenv import load_dotenv 
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
 
 # -------------------------
 # Load environment variables
@@ -23,12 +31,22 @@ KIRA_FARMUPDATES_CHANNEL_ID = int(os.getenv("KIRA_FARMUPDATES_CHANNEL_ID"))
 BOTFARMUPDATES_CHANNEL_ID = int(os.getenv("BOTFARMUPDATES_CHANNEL_ID"))
 FARMS_STATUS_CHANNEL_ID = int(os.getenv("FARMS_STATUS_CHANNEL_ID"))
 ROLE_TO_PING = os.getenv("PING_ROLE", "internal")
+PING_ROLE_ID = int(os.getenv("PING_ROLE_ID", "0"))
+LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+KIRA_USER_ID = int(os.getenv("KIRA_USER_ID", "0"))
+KIRA_AUTHOR_NAME = "shakira"
 
 
 # -------------------------
 # Logging
 # -------------------------
-handler = logging.FileHandler(filename="discord.log", encoding="utf-8", mode="w")
+# Rotate instead of growing without bound, and buffer records in memory so the
+# gateway's chatter becomes batched writes; WARNING and above flush right away.
+file_handler = RotatingFileHandler(filename="discord.log", encoding="utf-8", maxBytes=5_000_000, backupCount=3)
+file_handler.setFormatter(logging.Formatter(
+    "[{asctime}] [{levelname:<8}] {name}: {message}", "%Y-%m-%d %H:%M:%S", style="{"
+))
+handler = MemoryHandler(capacity=512, flushLevel=logging.WARNING, target=file_handler)
 
 
 # -------------------------
@@ -37,7 +55,16 @@ handler = logging.FileHandler(filename="discord.log", encoding="utf-8", mode="w"
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+
+class AgriBot(commands.Bot):
+    async def close(self):
+        # make sure debounced changes hit disk before shutting down
+        await flush_farms()
+        await super().close()
+
+
+bot = AgriBot(command_prefix="!", intents=intents)
 GUILD_OBJ = discord.Object(id=GUILD_ID) if GUILD_ID != 0 else None
 
 
@@ -45,8 +72,15 @@ GUILD_OBJ = discord.Object(id=GUILD_ID) if GUILD_ID != 0 else None
 # Regex for Kira messages
 # -------------------------
 KIRA_REGEX = re.compile(
-    r"`\[(?P<time>\d{2}:\d{2}:\d{2})\]`\s*`\[.*?\]`\s*\*\*\[(?P<user>.*?)\]\*\*\s*(?P<msg>.*)"
+    r"`\[(?P<time>\d{2}:\d{2}:\d{2})\]`\s*`\[.*?\]`\s*\*\*\[(?P<user>.*?)\]\*\*\s*(?P<msg>.*)\Z"
 )
+# Cheap check of the fixed `[hh:mm:ss]` ` prefix, run before the full pattern.
+# Both are bound once so the per-message path skips the attribute lookup; the
+# trailing \Z keeps the old fullmatch semantics for the anchored match().
+_KIRA_FAST = re.compile(r"`\[\d{2}:\d{2}:\d{2}\]`\s*`").match
+_KIRA_MATCH = KIRA_REGEX.match
+
+_TIMESTAMP_FMT = "%Y-%m-%d %H:%M:%S"
 
 
 # -------------------------
@@ -56,24 +90,119 @@ STATUS_UNKNOWN = "Unknown"
 STATUS_FARMING = "Currently being farmed"
 STATUS_READY = "Ready to be farmed"
 
+# Embed text for farms without a pending next_ready
+_STATUS_DISPLAY = {
+    STATUS_READY: "🌱 Ready",
+    STATUS_FARMING: "⏳ Currently being farmed",
+    STATUS_UNKNOWN: "❌ Unknown",
+}
+_FARM_VALUE_TMPL = (
+    "**Coords:** {coords}\n"
+    "**Total Output:** {output}\n"
+    "**Runtime:** {runtime} minutes\n"
+    "**Status:** {status}\n"
+)
+
 
 # -------------------------
 # JSON file and persistence
 # -------------------------
-FARMS_JSON_FILE = "farms.json"
+# Each farm lives in its own file under FARMS_DIR (named by a hash of the cleaned
+# farm name) so a status change only rewrites that farm; message ids and farm
+# order live in META_JSON_FILE.
+FARMS_DIR = "farms"
+META_JSON_FILE = "meta.json"
+FARMS_JSON_FILE = "farms.json"  # legacy single-file store, migrated on first run
 
 
-def load_farms():
+def _clean(name: str) -> str:
     """
-    Returns dict with keys: last_message_id, status_message_id, farms (list).
-    Converts numeric runtime/regrow_time stored in JSON back to timedelta.
+    Lowercase and collapse whitespace so lookups ignore case/spacing differences.
     """
-    if not os.path.exists(FARMS_JSON_FILE):
-        return {"last_message_id": None, "status_message_id": None, "farms": []}
+    return " ".join(name.lower().split())
+
+
+def _farm_path(name: str) -> str:
+    # hash the cleaned name so any legal farm name maps to a short, fixed-length
+    # filename; the real name is stored inside the JSON
+    digest = hashlib.sha1(_clean(name).encode("utf-8")).hexdigest()
+    return os.path.join(FARMS_DIR, digest + ".json")
+
+
+def _normalize_farm(farm):
+    """
+    Coerces a farm dict in place so the rest of the bot can rely on its types:
+    runtime/regrow_time are timedeltas, next_ready is a tz-aware datetime or None,
+    and status is always set.
+    """
+    for key in ("runtime", "regrow_time"):
+        value = farm.get(key)
+        if isinstance(value, (int, float)):
+            # stored as seconds in JSON
+            farm[key] = timedelta(seconds=value)
+        elif not isinstance(value, timedelta):
+            farm[key] = timedelta()
+    nr = farm.get("next_ready")
+    if isinstance(nr, str):
+        try:
+            nr = datetime.fromisoformat(nr)
+        except ValueError:
+            nr = None
+    if isinstance(nr, datetime):
+        if nr.tzinfo is None:
+            nr = nr.replace(tzinfo=timezone.utc)
+    else:
+        nr = None
+    farm["next_ready"] = nr
+    if "status" not in farm:
+        farm["status"] = STATUS_UNKNOWN
+    return farm
+
+
+def _json_default(obj):
+    # timedeltas are stored as whole seconds; orjson handles datetimes itself
+    if isinstance(obj, timedelta):
+        return int(obj.total_seconds())
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, default=_json_default, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json(path):
     try:
-        with open(FARMS_JSON_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
+        with open(path, "rb") as f:
+            return _loads(f.read())
+    except (ValueError, FileNotFoundError):
+        # ValueError covers json/orjson decode errors and UnicodeDecodeError from
+        # the stdlib path on non-UTF-8 bytes
+        return None
+
+
+def _write_atomic(path, payload: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _load_legacy_farms():
+    """
+    Reads the old single-file FARMS_JSON_FILE (dict or bare list format).
+    """
+    data = _read_json(FARMS_JSON_FILE)
+    if data is None:
         return {"last_message_id": None, "status_message_id": None, "farms": []}
 
 
@@ -82,47 +211,221 @@ def load_farms():
         data = {"last_message_id": None, "status_message_id": None, "farms": data}
 
 
-    # Convert stored secs back to timedelta
     for farm in data.get("farms", []):
-        # next_ready was stored as ISO str or None
-        if "next_ready" in farm and farm["next_ready"]:
-            try:
-                farm["next_ready"] = datetime.fromisoformat(farm["next_ready"])
-            except Exception:
-                farm["next_ready"] = None
-        # runtime/regrow_time stored 
-        if "runtime" in farm and isinstance(farm["runtime"], (int, float)):
-            # runtime previously saved as seconds — convert to timedelta
-            farm["runtime"] = timedelta(seconds=farm["runtime"])
-        if "regrow_time" in farm and isinstance(farm["regrow_time"], (int, float)):
-            farm["regrow_time"] = timedelta(seconds=farm["regrow_time"])
-        if "status" not in farm:
-            farm["status"] = STATUS_UNKNOWN
+        _normalize_farm(farm)
+    return data
 
 
-    return data
+def load_farms():
+    """
+    Returns dict with keys: last_message_id, status_message_id, farms (list).
+    Farms are run through _normalize_farm so stored seconds/ISO strings come back
+    as timedelta/datetime. A legacy farms.json is migrated to FARMS_DIR on first run.
+    """
+    if not os.path.isdir(FARMS_DIR) and os.path.exists(FARMS_JSON_FILE):
+        data = _load_legacy_farms()
+        _save_farms_sync(data)
+        return data
+
+    meta = _read_json(META_JSON_FILE) or {}
+    by_key = {}
+    if os.path.isdir(FARMS_DIR):
+        for entry in os.scandir(FARMS_DIR):
+            if not entry.name.endswith(".json"):
+                continue
+            farm = _read_json(entry.path)
+            if isinstance(farm, dict) and "name" in farm:
+                by_key[_clean(farm["name"])] = _normalize_farm(farm)
+
+    # keep the order from meta; files it doesn't list go last
+    farms = [by_key.pop(_clean(name)) for name in meta.get("farm_order", []) if _clean(name) in by_key]
+    farms.extend(by_key.values())
+    return {
+        "last_message_id": meta.get("last_message_id"),
+        "status_message_id": meta.get("status_message_id"),
+        "farms": farms
+    }
 
 
-def save_farms(data):
+def save_farm(farm):
     """
-    Writes data (dict) to FARMS_JSON_FILE converting datetimes/timedeltas to serializable forms.
+    Writes a single farm to its file; _dumps handles datetimes/timedeltas.
     """
-    out = {
+    # serialize in memory so the file gets a single write, then swap it in atomically
+    _write_atomic(_farm_path(farm["name"]), _dumps(farm))
+
+
+def _meta_payload(data) -> bytes:
+    return _dumps({
         "last_message_id": data.get("last_message_id"),
         "status_message_id": data.get("status_message_id"),
-        "farms": []
-    }
+        "farm_order": [farm["name"] for farm in data.get("farms", [])]
+    })
+
+
+def save_meta(data):
+    _write_atomic(META_JSON_FILE, _meta_payload(data))
+
+
+def _save_farms_sync(data):
+    """
+    Writes every farm plus the meta file; used for the first-run migration.
+    """
+    os.makedirs(FARMS_DIR, exist_ok=True)
     for farm in data.get("farms", []):
-        f = farm.copy()
-        if "next_ready" in f and isinstance(f["next_ready"], datetime):
-            f["next_ready"] = f["next_ready"].isoformat()
-        if "runtime" in f and isinstance(f["runtime"], timedelta):
-            f["runtime"] = int(f["runtime"].total_seconds())
-        if "regrow_time" in f and isinstance(f["regrow_time"], timedelta):
-            f["regrow_time"] = int(f["regrow_time"].total_seconds())
-        out["farms"].append(f)
-    with open(FARMS_JSON_FILE, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=4)
+        save_farm(farm)
+    save_meta(data)
+
+
+def _build_snapshot(data, changed, removed, meta_changed):
+    """
+    Serializes the pending changes on the event loop and returns (writes, deletes),
+    where writes is a list of (tag, path, bytes) and deletes a list of (tag, path).
+    The writer thread only ever sees these immutable payloads, never the live farm
+    dicts that coroutines keep mutating. Tags identify what to re-queue on failure.
+    """
+    writes = [(("farm", key), _farm_path(farm["name"]), _dumps(farm)) for key, farm in changed.items()]
+    if meta_changed:
+        writes.append((("meta", None), META_JSON_FILE, _meta_payload(data)))
+    deletes = [(("removed", key), _farm_path(key)) for key in removed]
+    return writes, deletes
+
+
+def _apply_snapshot_sync(writes, deletes):
+    """
+    Applies each delete/write independently and returns the tags of those that failed.
+    """
+    failed = []
+    try:
+        os.makedirs(FARMS_DIR, exist_ok=True)
+    except OSError as e:
+        print("Error creating farms directory:", e)
+    # deletions first so a farm removed and re-added under the same name ends up on disk
+    for tag, path in deletes:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print("Error deleting", path, e)
+            failed.append(tag)
+    for tag, path, payload in writes:
+        try:
+            _write_atomic(path, payload)
+        except OSError as e:
+            print("Error writing", path, e)
+            failed.append(tag)
+    return failed
+
+
+async def save_snapshot_async(writes, deletes):
+    """
+    Runs _apply_snapshot_sync in a worker thread so disk I/O doesn't stall the event loop.
+    """
+    return await asyncio.to_thread(_apply_snapshot_sync, writes, deletes)
+
+
+# -------------------------
+# Debounced persistence
+# -------------------------
+FLUSH_DELAY_SECONDS = 1.0
+_dirty = asyncio.Event()
+_save_lock = asyncio.Lock()
+_flush_task = None
+_dirty_farms = {}       # cleaned name -> farm waiting to be written
+_removed_farms = set()  # cleaned names whose files should be deleted
+_meta_dirty = False
+
+
+def _mark_dirty(farm=None):
+    """
+    Flag a farm (or, with no argument, the meta fields) as changed; the flush loop
+    writes it out after FLUSH_DELAY_SECONDS.
+    """
+    global _meta_dirty
+    if farm is None:
+        _meta_dirty = True
+    else:
+        _dirty_farms[_clean(farm["name"])] = farm
+    _dirty.set()
+
+
+def _mark_removed(farm):
+    """
+    Flag a farm's file for deletion; the farm order in meta changes too.
+    """
+    global _meta_dirty
+    key = _clean(farm["name"])
+    _dirty_farms.pop(key, None)
+    _removed_farms.add(key)
+    _meta_dirty = True
+    _dirty.set()
+
+
+def _requeue(failed, changed):
+    """
+    Put failed writes/deletes back in the pending sets so the next flush retries them,
+    unless a newer change to the same farm has superseded them.
+    """
+    global _meta_dirty
+    for kind, key in failed:
+        if kind == "farm":
+            if key not in _dirty_farms and key not in _removed_farms:
+                _dirty_farms[key] = changed[key]
+        elif kind == "removed":
+            _removed_farms.add(key)
+        else:
+            _meta_dirty = True
+    if failed:
+        _dirty.set()
+
+
+async def _write_farms():
+    global _meta_dirty
+    async with _save_lock:
+        _dirty.clear()
+        changed = dict(_dirty_farms)
+        removed = set(_removed_farms)
+        meta_changed = _meta_dirty
+        _dirty_farms.clear()
+        _removed_farms.clear()
+        _meta_dirty = False
+        tags = [("farm", key) for key in changed] + [("removed", key) for key in removed]
+        if meta_changed:
+            tags.append(("meta", None))
+        try:
+            writes, deletes = _build_snapshot(data, changed, removed, meta_changed)
+            failed = await save_snapshot_async(writes, deletes)
+        except BaseException:
+            # nothing is known to have landed; keep every pending change
+            _requeue(tags, changed)
+            raise
+        _requeue(failed, changed)
+
+
+async def flush_farms():
+    """
+    Write pending changes immediately instead of waiting for the flush loop.
+    """
+    if _dirty.is_set():
+        await _write_farms()
+
+
+async def _flush_loop():
+    """
+    Coalesces bursts of changes into a single write per FLUSH_DELAY_SECONDS window.
+    """
+    while True:
+        await _dirty.wait()
+        await asyncio.sleep(FLUSH_DELAY_SECONDS)
+        if _batch_mode:
+            # catch-up in progress; on_ready flushes once it is done
+            continue
+        try:
+            # no-op if flush_farms() already drained the queue during the sleep
+            await flush_farms()
+        except Exception as e:
+            print("Error saving farms:", e)
 
 
 # -------------------------
@@ -131,72 +434,236 @@ def save_farms(data):
 data = load_farms()
 farms = data.get("farms", [])
 
+
+# -------------------------
+# Farm name index
+# -------------------------
+_farms_index = {}   # cleaned name -> farm
+_autocomplete_entries = []  # [(cleaned name, Choice)] reused by every autocomplete call
+
+
+def _rebuild_index():
+    """
+    Build the name lookups from scratch; used once farms are loaded at startup.
+    """
+    _farms_index.clear()
+    _autocomplete_entries.clear()
+    for farm in farms:
+        _index_farm(farm)
+
+
+def _index_farm(farm):
+    """
+    Add a single farm to the name lookups without rebuilding them.
+    """
+    key = _clean(farm["name"])
+    _farms_index[key] = farm
+    _autocomplete_entries.append((key, app_commands.Choice(name=farm["name"], value=farm["name"])))
+
+
+def _unindex_farm(farm):
+    """
+    Drop a single farm from the name lookups without rebuilding them.
+    """
+    key = _clean(farm["name"])
+    _farms_index.pop(key, None)
+    _autocomplete_entries[:] = [entry for entry in _autocomplete_entries if entry[0] != key]
+
+
+_rebuild_index()
+
+# -------------------------
+# Cached Discord objects
+# -------------------------
+_CHANNEL_IDS = {
+    "bot_channel": BOTFARMUPDATES_CHANNEL_ID,
+    "status_channel": FARMS_STATUS_CHANNEL_ID,
+    "kira_channel": KIRA_FARMUPDATES_CHANNEL_ID,
+}
+_cached = {"bot_channel": None, "status_channel": None, "kira_channel": None}
+_ping_role_id = PING_ROLE_ID or None
+_ping_mention = "@" + ROLE_TO_PING  # plain-text fallback until the role is resolved
+_kira_user_id = KIRA_USER_ID or None
+
+
+def _resolve_cached():
+    """
+    Look up the configured channels and the ping role once (called from on_ready).
+    """
+    for key, channel_id in _CHANNEL_IDS.items():
+        _cached[key] = bot.get_channel(channel_id)
+    bot_channel = _cached["bot_channel"]
+    guild = bot_channel.guild if bot_channel else None
+    if guild:
+        # PING_ROLE_ID is an O(1) get_role; otherwise scan for ROLE_TO_PING once
+        role = guild.get_role(_ping_role_id) if _ping_role_id else None
+        if role is None:
+            role = discord.utils.get(guild.roles, name=ROLE_TO_PING)
+        _set_ping_role(role.id if role else None)
+
+    # Resolve the Kira relay account's id so on_message can compare ints instead of names
+    global _kira_user_id
+    kira_channel = _cached["kira_channel"]
+    if _kira_user_id is None and kira_channel and kira_channel.guild:
+        member = discord.utils.find(lambda m: m.name.lower() == KIRA_AUTHOR_NAME, kira_channel.guild.members)
+        if member:
+            _kira_user_id = member.id
+
+
+def get_cached_channel(key):
+    """
+    Return a cached channel by key, falling back to bot.get_channel on a miss.
+    """
+    channel = _cached[key]
+    if channel is None:
+        channel = bot.get_channel(_CHANNEL_IDS[key])
+        _cached[key] = channel
+    return channel
+
+
+def is_kira_author(author):
+    """
+    True if author is the Kira relay account (by id once known, else by name).
+    """
+    if _kira_user_id is not None:
+        return author.id == _kira_user_id
+    return author.name.lower() == KIRA_AUTHOR_NAME
+
+
+def _set_ping_role(role_id):
+    """
+    Remember the ping role's id and precompute its mention string for send().
+    """
+    global _ping_role_id, _ping_mention
+    _ping_role_id = role_id
+    _ping_mention = f"<@&{role_id}>" if role_id else "@" + ROLE_TO_PING
+
+
 # -------------------------
 # Scheduler / notification helpers
 # -------------------------
-_scheduled_tasks = {}
+# A single scheduler task drains a min-heap of (deadline, farm name, kind) entries.
+# Entries are never removed in place: when popped they are checked against the
+# farm's current state and skipped if they were superseded.
+SCHEDULE_READY = "ready"
+SCHEDULE_FAILSAFE = "failsafe"
+_schedule_heap = []
+_schedule_wakeup = asyncio.Event()
+_failsafe_deadlines = {}  # farm name -> pending failsafe deadline
+_scheduler_task = None
+_fire_tasks = set()  # strong refs to in-flight notifications
 
 
 async def notify_farm_ready_plain(farm):
     """
     Sends plain ping message to BOTFARMUPDATES_CHANNEL_ID when a farm becomes ready.
     """
-    channel = bot.get_channel(BOTFARMUPDATES_CHANNEL_ID)
+    channel = get_cached_channel("bot_channel")
     if not channel:
         print("Bot updates channel not found:", BOTFARMUPDATES_CHANNEL_ID)
         return
 
 
-    guild = channel.guild
-    role = discord.utils.get(guild.roles, name=ROLE_TO_PING) if guild else None
-
-
     farm["status"] = STATUS_READY
     farm["next_ready"] = None
-    save_farms(data)
-    await update_farms_embed()
-    await channel.send(f"{role.mention if role else '@'+ROLE_TO_PING} {farm['name']} is ready to be farmed again!")
+    _mark_dirty(farm)
+    await flush_farms()
+    schedule_embed_update()
+    await channel.send(f"{_ping_mention} {farm['name']} is ready to be farmed again!")
 
 
-async def schedule_notification_for_farm(farm):
+async def run_failsafe(farm):
     """
-    Internal: sleep until next_ready then notify
+    Switch a farm that never reported "finished" over to regrowing.
     """
-    if "next_ready" not in farm or farm["next_ready"] is None:
-        return
-    nr = farm["next_ready"]
-    if isinstance(nr, str):
-        try:
-            nr = datetime.fromisoformat(nr)
-        except Exception:
-            farm["next_ready"] = None
-            save_farms(data)
-            return
-    if nr.tzinfo is None:
-        nr = nr.replace(tzinfo=timezone.utc)
-    now = datetime.now(timezone.utc)
-    delay = (nr - now).total_seconds()
-    if delay <= 0:
-        await notify_farm_ready_plain(farm)
-        return
-    try:
-        await asyncio.sleep(delay)
-        await notify_farm_ready_plain(farm)
-    except asyncio.CancelledError:
+    # only run if farm hasn't already finished
+    if farm.get("next_ready") is not None:
         return
+    next_ready_dt = datetime.now(timezone.utc) + farm["regrow_time"]
+    farm["next_ready"] = next_ready_dt
+    farm["status"] = STATUS_FARMING
+    _mark_dirty(farm)
+    schedule_embed_update()
+
+    # schedule the ready ping
+    schedule_task_for_farm(farm)
+
+    bot_channel = get_cached_channel("bot_channel")
+    if bot_channel:
+        await bot_channel.send(
+            f"{_ping_mention} {farm['name']} has auto-switched to regrowing (failsafe). Next ready <t:{int(next_ready_dt.timestamp())}:R>"
+        )
+
+
+def _push_schedule(deadline, name, kind):
+    heapq.heappush(_schedule_heap, (deadline, name, kind))
+    _schedule_wakeup.set()
 
 
 def schedule_task_for_farm(farm):
     """
-    Create/replace scheduled notification task for a farm.
+    Replace any pending timer (failsafe or ready) for a farm with one for its next_ready.
     """
-    name = farm["name"]
-    old = _scheduled_tasks.get(name)
-    if old and not old.done():
-        old.cancel()
+    _failsafe_deadlines.pop(farm["name"], None)
     if farm.get("next_ready"):
-        task = asyncio.create_task(schedule_notification_for_farm(farm))
-        _scheduled_tasks[name] = task
+        _push_schedule(farm["next_ready"], farm["name"], SCHEDULE_READY)
+
+
+def schedule_failsafe_for_farm(farm):
+    """
+    Schedule the failsafe switchover 2*runtime from now.
+    """
+    deadline = datetime.now(timezone.utc) + farm["runtime"] * 2
+    _failsafe_deadlines[farm["name"]] = deadline
+    _push_schedule(deadline, farm["name"], SCHEDULE_FAILSAFE)
+
+
+def cancel_schedule_for_farm(name):
+    # ready entries go stale on their own once the farm is gone
+    _failsafe_deadlines.pop(name, None)
+
+
+async def _fire_schedule(deadline, name, kind):
+    farm = _farms_index.get(_clean(name))
+    if not farm:
+        return
+    if kind == SCHEDULE_READY:
+        if farm.get("next_ready") == deadline:
+            await notify_farm_ready_plain(farm)
+    elif _failsafe_deadlines.get(name) == deadline:
+        del _failsafe_deadlines[name]
+        await run_failsafe(farm)
+
+
+async def _scheduler_loop():
+    """
+    Sleeps until the earliest deadline, waking early whenever a new entry is pushed.
+    """
+    while True:
+        _schedule_wakeup.clear()
+        if not _schedule_heap:
+            await _schedule_wakeup.wait()
+            continue
+        deadline, name, kind = _schedule_heap[0]
+        delay = (deadline - datetime.now(timezone.utc)).total_seconds()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(_schedule_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            # re-peek: either the deadline passed or an earlier entry arrived
+            continue
+        heapq.heappop(_schedule_heap)
+        # notify in its own task so a slow or rate-limited send can't hold up other deadlines
+        task = asyncio.create_task(_fire_schedule(deadline, name, kind), name=f"{kind}:{name}")
+        _fire_tasks.add(task)
+        task.add_done_callback(_on_fire_done)
+
+
+def _on_fire_done(task):
+    _fire_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print("Scheduled task failed for", task.get_name(), repr(task.exception()))
 
 
 # -------------------------
@@ -208,12 +675,12 @@ def find_farms_by_name_partial(name_raw: str):
     """
     if not name_raw:
         return []
-    clean = re.sub(r"\s+", " ", name_raw.strip().lower())
-    exact = [f for f in farms if f["name"].strip().lower() == clean]
+    clean = _clean(name_raw)
+    exact = _farms_index.get(clean)
     if exact:
-        return exact
+        return [exact]
     # fallback: contains
-    partial = [f for f in farms if clean in f["name"].strip().lower()]
+    partial = [f for key, f in _farms_index.items() if clean in key]
     return partial
 
 
@@ -225,80 +692,139 @@ def get_farm_exact(name_raw: str):
 # -------------------------
 # Live embed management (single message)
 # -------------------------
+EMBED_COALESCE_SECONDS = 0.5
+_last_embed_hash = None
+_embed_update_queued = False
+_embed_tasks = set()  # strong refs to in-flight background refreshes
+_embed_lock = asyncio.Lock()
+_field_cache = {}  # farm name -> (signature, (name, value))
+
+
+def _render_farm_field(farm):
+    """
+    Returns the (name, value) embed field for a farm, reusing the cached text while
+    the fields it is built from are unchanged.
+    """
+    signature = (
+        farm["status"], farm["next_ready"], farm.get("coords"), farm.get("total_output"), farm["runtime"]
+    )
+    cached = _field_cache.get(farm["name"])
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    nr = farm["next_ready"]
+    if nr:
+        status_display = f"⏳ Will be ready <t:{int(nr.timestamp())}:R>"
+    else:
+        status_display = _STATUS_DISPLAY.get(farm["status"], _STATUS_DISPLAY[STATUS_UNKNOWN])
+    field = (
+        farm["name"],
+        _FARM_VALUE_TMPL.format_map({
+            "coords": farm.get("coords", "unknown"),
+            "output": farm.get("total_output", "unknown"),
+            "runtime": int(farm["runtime"].total_seconds() / 60),
+            "status": status_display,
+        })
+    )
+    _field_cache[farm["name"]] = (signature, field)
+    return field
+
+
+def schedule_embed_update():
+    """
+    Queue a background refresh of the live embed EMBED_COALESCE_SECONDS from now.
+    Calls made while one is already queued ride along with it, so a burst of state
+    changes costs one edit and callers never wait on Discord.
+    """
+    global _embed_update_queued
+    if _embed_update_queued:
+        return
+    _embed_update_queued = True
+    task = asyncio.create_task(_delayed_embed_update())
+    _embed_tasks.add(task)
+    task.add_done_callback(_embed_tasks.discard)
+
+
+async def _delayed_embed_update():
+    global _embed_update_queued
+    try:
+        await asyncio.sleep(EMBED_COALESCE_SECONDS)
+    finally:
+        # changes arriving from here on queue a fresh refresh instead of joining this one
+        _embed_update_queued = False
+    try:
+        await update_farms_embed()
+    except Exception as e:
+        print("Error updating farms embed:", e)
+
+
 async def update_farms_embed():
-    channel = bot.get_channel(FARMS_STATUS_CHANNEL_ID)
+    if _batch_mode:
+        return
+    async with _embed_lock:
+        await _refresh_farms_embed()
+
+
+async def _refresh_farms_embed():
+    global _last_embed_hash
+    channel = get_cached_channel("status_channel")
     if not channel:
         # channel not found: likely not in guild / missing perms
         print("Status channel not found:", FARMS_STATUS_CHANNEL_ID)
         return
 
 
+    fields = tuple(_render_farm_field(farm) for farm in farms)
+
+
+    # Skip the Discord round trip if nothing visible changed since the last edit
+    embed_hash = hash(fields)
+    msg_id = data.get("status_message_id")
+    if msg_id and embed_hash == _last_embed_hash:
+        return
+
     embed = discord.Embed(
         title="CivMC Agriculture Farms",
         description="Current status of all farms:",
         color=discord.Color.green()
     )
+    for name, value in fields:
+        embed.add_field(name=name, value=value, inline=False)
 
-
-    for farm in farms:
-        coords = farm.get("coords", "unknown")
-        output = farm.get("total_output", "unknown")
-        runtime = farm.get("runtime", timedelta())
-        if isinstance(runtime, (int, float)):
-            runtime = timedelta(seconds=runtime)
-        runtime_minutes = int(runtime.total_seconds() / 60) if isinstance(runtime, timedelta) else "?"
-        status = farm.get("status", STATUS_UNKNOWN)
-
-
-        if farm.get("next_ready") and isinstance(farm["next_ready"], datetime):
-            nr = farm["next_ready"]
-            if nr.tzinfo is None:
-                nr = nr.replace(tzinfo=timezone.utc)
-            status_display = f"⏳ Will be ready <t:{int(nr.timestamp())}:R>"
-        else:
-            if status == STATUS_READY:
-                status_display = "🌱 Ready"
-            elif status == STATUS_FARMING:
-                status_display = "⏳ Currently being farmed"
-            else:
-                status_display = "❌ Unknown"
-
-
-        embed.add_field(
-            name=farm["name"],
-            value=(
-                f"**Coords:** {coords}\n"
-                f"**Total Output:** {output}\n"
-                f"**Runtime:** {runtime_minutes} minutes\n"
-                f"**Status:** {status_display}\n"
-            ),
-            inline=False
-        )
-
-
-    msg_id = data.get("status_message_id")
     try:
         if msg_id:
-            msg = await channel.fetch_message(msg_id)
-            await msg.edit(embed=embed)
+            # edit through a partial message: no GET first, and a deleted message
+            # still raises NotFound so it is recreated below
+            await channel.get_partial_message(msg_id).edit(embed=embed)
         else:
             msg = await channel.send(embed=embed)
             data["status_message_id"] = msg.id
-            save_farms(data)
+            _mark_dirty()
     except discord.NotFound:
         # message deleted: recreate and store new id
         msg = await channel.send(embed=embed)
         data["status_message_id"] = msg.id
-        save_farms(data)
+        _mark_dirty()
         await channel.send("⚠️ The live farm status embed was deleted. A new one has been created.")
+    _last_embed_hash = embed_hash
 
 
 # -------------------------
 # Kira message processing
 # -------------------------
+# While on_ready replays missed messages, embed refreshes, disk flushes and the
+# per-message notifications are held back; the notifications are collected in
+# _batch_events and posted as one summary afterwards.
+_batch_mode = False
+_batch_events = []
+
+
 async def process_kira_message(message: discord.Message):
     text = message.content
-    match = KIRA_REGEX.fullmatch(text)
+    # cheap reject before running the regex on unrelated chatter
+    if not _KIRA_FAST(text):
+        return
+    match = _KIRA_MATCH(text)
     if not match:
         return
 
@@ -317,24 +843,13 @@ async def process_kira_message(message: discord.Message):
         print("Unknown farm in Kira message:", farm_name_part)
         return
 
-    bot_channel = bot.get_channel(BOTFARMUPDATES_CHANNEL_ID)
+    bot_channel = get_cached_channel("bot_channel")
     created_at = message.created_at
     if created_at.tzinfo is None:
         created_at = created_at.replace(tzinfo=timezone.utc)
     else:
         created_at = created_at.astimezone(timezone.utc)
-
-    # Normalize regrow_time/runtime to timedelta
-    if not isinstance(farm.get("regrow_time"), timedelta):
-        if isinstance(farm.get("regrow_time"), (int, float)):
-            farm["regrow_time"] = timedelta(seconds=farm["regrow_time"])
-        else:
-            farm["regrow_time"] = timedelta(seconds=0)
-    if not isinstance(farm.get("runtime"), timedelta):
-        if isinstance(farm.get("runtime"), (int, float)):
-            farm["runtime"] = timedelta(seconds=farm["runtime"])
-        else:
-            farm["runtime"] = timedelta(seconds=0)
+    created_at_str = created_at.strftime(_TIMESTAMP_FMT)
 
     # -------------------------
     # Handle start
@@ -342,50 +857,23 @@ async def process_kira_message(message: discord.Message):
     if "started" in status_text:
         farm["status"] = STATUS_FARMING
         farm["next_ready"] = None
-        save_farms(data)
-        await update_farms_embed()
+        _mark_dirty(farm)
+        schedule_embed_update()
 
-        # cancel any existing scheduled task
-        task = _scheduled_tasks.get(farm["name"])
-        if task and not task.done():
-            task.cancel()
-            _scheduled_tasks.pop(farm["name"], None)
-
-        # schedule switchover after 2*runtime
-        async def failsafe_task():
-            try:
-                await asyncio.sleep((farm["runtime"] * 2).total_seconds())
-                # only run if farm hasn't already finished
-                if farm.get("next_ready") is None:
-                    next_ready_dt = datetime.now(timezone.utc) + farm["regrow_time"]
-                    farm["next_ready"] = next_ready_dt
-                    farm["status"] = STATUS_FARMING
-                    save_farms(data)
-                    await update_farms_embed()
-
-                    # schedule the ready ping
-                    schedule_task_for_farm(farm)
-
-                    if bot_channel:
-                        role = discord.utils.get(bot_channel.guild.roles, name=ROLE_TO_PING)
-                        await bot_channel.send(
-                            f"{role.mention if role else '@'+ROLE_TO_PING} {farm['name']} has auto-switched to regrowing (failsafe). Next ready <t:{int(next_ready_dt.timestamp())}:R>"
-                        )
-            except asyncio.CancelledError:
-                return
-
-
-        _scheduled_tasks[farm["name"]] = asyncio.create_task(failsafe_task())
+        # schedule switchover after 2*runtime (supersedes any pending ready timer)
+        schedule_failsafe_for_farm(farm)
 
         # Send embed notification for start
-        if bot_channel:
+        if _batch_mode:
+            _batch_events.append(f"▶️ {user} started **{farm['name']}** at {time_str}")
+        elif bot_channel:
             embed = discord.Embed(
                 title=f"{farm['name']} — started",
                 description=f"{user} has started farming **{farm['name']}**.",
                 color=discord.Color.orange()
             )
             embed.add_field(name="Kira time (UTC)", value=time_str, inline=True)
-            embed.add_field(name="Recorded at (UTC)", value=created_at.strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+            embed.add_field(name="Recorded at (UTC)", value=created_at_str, inline=True)
             await bot_channel.send(embed=embed)
 
     # -------------------------
@@ -395,24 +883,28 @@ async def process_kira_message(message: discord.Message):
         next_ready_dt = created_at + farm["regrow_time"]
         farm["next_ready"] = next_ready_dt
         farm["status"] = STATUS_FARMING
-        save_farms(data)
-        await update_farms_embed()
+        _mark_dirty(farm)
+        schedule_embed_update()
         schedule_task_for_farm(farm)  # cancels failsafe and replaces with real timer
 
-        if bot_channel:
+        if _batch_mode:
+            _batch_events.append(
+                f"✅ {user} finished **{farm['name']}** at {time_str}, next ready <t:{int(next_ready_dt.timestamp())}:R>"
+            )
+        elif bot_channel:
             embed = discord.Embed(
                 title=f"{farm['name']} — finished",
                 description=f"{user} has finished farming **{farm['name']}**.",
                 color=discord.Color.green()
             )
             embed.add_field(name="Kira time (UTC)", value=time_str, inline=True)
-            embed.add_field(name="Recorded at (UTC)", value=created_at.strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+            embed.add_field(name="Recorded at (UTC)", value=created_at_str, inline=True)
             embed.add_field(name="Next Ready (UTC)", value=f"<t:{int(next_ready_dt.timestamp())}:F>", inline=False)
             await bot_channel.send(embed=embed)
 
     # persist last processed message id
     data["last_message_id"] = message.id
-    save_farms(data)
+    _mark_dirty()
 
 
 
@@ -430,45 +922,16 @@ async def farms_command(interaction: discord.Interaction, farm_name: str):
 
 
     embed = discord.Embed(title=f"{farm['name']} Status", color=discord.Color.green())
-    coords = farm.get("coords", "unknown")
-    output = farm.get("total_output", "unknown")
-    runtime = farm.get("runtime", timedelta())
-    if isinstance(runtime, (int, float)):
-        runtime = timedelta(seconds=runtime)
-    runtime_minutes = int(runtime.total_seconds() / 60) if isinstance(runtime, timedelta) else "?"
-    if farm.get("next_ready") and isinstance(farm["next_ready"], datetime):
-        nr = farm["next_ready"]
-        if nr.tzinfo is None:
-            nr = nr.replace(tzinfo=timezone.utc)
-        status_display = f"⏳ Will be ready <t:{int(nr.timestamp())}:R>"
-    else:
-        status = farm.get("status", STATUS_UNKNOWN)
-        if status == STATUS_READY:
-            status_display = "🌱 Ready"
-        elif status == STATUS_FARMING:
-            status_display = "⏳ Currently being farmed"
-        else:
-            status_display = "❌ Unknown"
-
-
-    embed.add_field(
-        name=farm["name"],
-        value=(
-            f"**Coords:** {coords}\n"
-            f"**Total Output:** {output}\n"
-            f"**Runtime:** {runtime_minutes} minutes\n"
-            f"**Status:** {status_display}\n"
-        ),
-        inline=False
-    )
+    name, value = _render_farm_field(farm)
+    embed.add_field(name=name, value=value, inline=False)
     await interaction.response.send_message(embed=embed)
 
 
 @farms_command.autocomplete("farm_name")
 async def farms_autocomplete(interaction: discord.Interaction, current: str):
     # Provide up to 25 matching choices (discord limit)
-    current_low = current or ""
-    choices = [app_commands.Choice(name=f["name"], value=f["name"]) for f in farms if current_low.lower() in f["name"].lower()][:25]
+    current_low = _clean(current or "")
+    choices = [choice for key, choice in _autocomplete_entries if current_low in key][:25]
     return choices
 
 
@@ -478,29 +941,26 @@ async def farms_autocomplete(interaction: discord.Interaction, current: str):
 @bot.tree.command(name="removefarm", description="Remove a farm", guild=GUILD_OBJ)
 @app_commands.describe(farm_name="Select a farm to remove")
 async def removefarm(interaction: discord.Interaction, farm_name: str):
-    global farms
-    farm_name_str = str(farm_name).strip().lower()
-    farm = next((f for f in farms if f["name"].strip().lower() == farm_name_str), None)
+    farm_name_str = _clean(str(farm_name))
+    farm = _farms_index.get(farm_name_str)
     if not farm:
         await interaction.response.send_message(f"❌ Farm '{farm_name}' not found.", ephemeral=True)
         return
 
 
     # Cancel any scheduled task
-    _task = _scheduled_tasks.get(farm["name"])
-    if _task and not _task.done():
-        _task.cancel()
-        _scheduled_tasks.pop(farm["name"], None)
+    cancel_schedule_for_farm(farm["name"])
+    _field_cache.pop(farm["name"], None)
 
 
-    # Remove farm from list
-    farms = [f for f in farms if f["name"].strip().lower() != farm_name_str]
-    data["farms"] = farms
-    save_farms(data)
+    # Remove farm from list in place so data["farms"] and other references stay valid
+    farms[:] = [f for f in farms if _clean(f["name"]) != farm_name_str]
+    _unindex_farm(farm)
+    _mark_removed(farm)
 
 
     # Update the live embed
-    await update_farms_embed()
+    schedule_embed_update()
 
 
     await interaction.response.send_message(f"✅ Farm '{farm['name']}' removed.", ephemeral=True)
@@ -513,12 +973,12 @@ async def removefarm(interaction: discord.Interaction, farm_name: str):
 # -------------------------
 @removefarm.autocomplete("farm_name")
 async def removefarm_autocomplete(interaction: discord.Interaction, current: str):
-    current_low = current or ""
+    current_low = _clean(current or "")
     # Return up to 25 matching farms dynamically
     return [
-        app_commands.Choice(name=f["name"], value=f["name"])
-        for f in farms
-        if current_low.lower() in f["name"].lower()
+        choice
+        for key, choice in _autocomplete_entries
+        if current_low in key
     ][:25]
 
 
@@ -542,7 +1002,7 @@ async def addfarm(
     regrow_hours: float
 ):
     # Only basic duplicate check (case-insensitive)
-    if any(f["name"].strip().lower() == name.strip().lower() for f in farms):
+    if _clean(name) in _farms_index:
         await interaction.response.send_message(f"❌ A farm named '{name}' already exists.", ephemeral=True)
         return
 
@@ -556,13 +1016,15 @@ async def addfarm(
         "next_ready": None,
         "status": STATUS_UNKNOWN
     }
-    farms.append(new_farm)
+    farms.append(_normalize_farm(new_farm))
     data["farms"] = farms
-    save_farms(data)
+    _index_farm(new_farm)
+    _mark_dirty(new_farm)
+    _mark_dirty()  # farm order
 
 
     # Schedule if had next_ready (none on create) and update embed
-    await update_farms_embed()
+    schedule_embed_update()
     # respond to user
     await interaction.response.send_message(f"✅ Farm **{name}** added.", ephemeral=False)
 
@@ -604,21 +1066,22 @@ async def editfarm(
     if regrow_hours is not None:
         farm["regrow_time"] = timedelta(hours=float(regrow_hours))
         updated.append("regrow_time")
+    _normalize_farm(farm)
 
     data["farms"] = farms
-    save_farms(data)
+    _mark_dirty(farm)
 
 
     # If next_ready / scheduling affected by edits, reschedule
     schedule_task_for_farm(farm)
-    await update_farms_embed()
+    schedule_embed_update()
     await interaction.response.send_message(f"✅ Updated {', '.join(updated) if updated else 'nothing'} for **{farm['name']}**.", ephemeral=True)
 
 
 @editfarm.autocomplete("farm_name")
 async def editfarm_autocomplete(interaction: discord.Interaction, current: str):
-    current_low = current or ""
-    return [app_commands.Choice(name=f["name"], value=f["name"]) for f in farms if current_low.lower() in f["name"].lower()][:25]
+    current_low = _clean(current or "")
+    return [choice for key, choice in _autocomplete_entries if current_low in key][:25]
 
 
 # -------------------------
@@ -626,6 +1089,12 @@ async def editfarm_autocomplete(interaction: discord.Interaction, current: str):
 # -------------------------
 @bot.event
 async def on_ready():
+    global _flush_task, _scheduler_task, _batch_mode
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush_loop())
+    if _scheduler_task is None or _scheduler_task.done():
+        _scheduler_task = asyncio.create_task(_scheduler_loop())
+
     # sync commands
     try:
         if GUILD_ID != 0:
@@ -637,32 +1106,47 @@ async def on_ready():
     except Exception as e:
         print("Error syncing commands:", e)
 
+    _resolve_cached()
+
 
     # Catch up missed Kira messages (only after last_message_id)
     now = datetime.now(timezone.utc)
-    kira_channel = bot.get_channel(KIRA_FARMUPDATES_CHANNEL_ID)
+    kira_channel = get_cached_channel("kira_channel")
     if kira_channel:
         after_msg = discord.Object(id=data["last_message_id"]) if data.get("last_message_id") else None
-        async for message in kira_channel.history(limit=200, after=after_msg, oldest_first=True):
-            if message.author.name.lower() == "shakira":
+        messages = [
+            message
+            async for message in kira_channel.history(limit=200, after=after_msg, oldest_first=True)
+            if is_kira_author(message.author)
+        ]
+        _batch_mode = True
+        try:
+            for message in messages:
                 await process_kira_message(message)
+        finally:
+            _batch_mode = False
+        await flush_farms()
+
+        bot_channel = get_cached_channel("bot_channel")
+        if _batch_events and bot_channel:
+            description = "\n".join(_batch_events)
+            if len(description) > 4096:
+                description = description[:4093] + "..."
+            await bot_channel.send(embed=discord.Embed(
+                title=f"Caught up on {len(_batch_events)} missed Kira update(s)",
+                description=description,
+                color=discord.Color.blue()
+            ))
+        _batch_events.clear()
 
 
     # schedule existing farms
     for farm in farms:
-        nr = farm.get("next_ready")
-        if isinstance(nr, str):
-            try:
-                farm["next_ready"] = datetime.fromisoformat(nr)
-            except Exception:
-                farm["next_ready"] = None
-        if isinstance(farm.get("next_ready"), datetime):
-            if farm["next_ready"].tzinfo is None:
-                farm["next_ready"] = farm["next_ready"].replace(tzinfo=timezone.utc)
+        if farm["next_ready"]:
             if farm["next_ready"] <= now:
                 farm["status"] = STATUS_READY
                 farm["next_ready"] = None
-                save_farms(data)
+                _mark_dirty(farm)
             else:
                 schedule_task_for_farm(farm)
 
@@ -676,12 +1160,46 @@ async def on_message(message):
     if message.author == bot.user:
         return
     # Process Kira messages only in configured Kira channel
-    if message.author.name.lower() == "shakira" and message.channel.id == KIRA_FARMUPDATES_CHANNEL_ID:
+    if message.channel.id == KIRA_FARMUPDATES_CHANNEL_ID and is_kira_author(message.author):
         await process_kira_message(message)
     await bot.process_commands(message)
 
 
+@bot.event
+async def on_guild_channel_update(before, after):
+    for key, channel_id in _CHANNEL_IDS.items():
+        if after.id == channel_id:
+            _cached[key] = after
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    for key, channel_id in _CHANNEL_IDS.items():
+        if channel.id == channel_id:
+            _cached[key] = None
+
+
+@bot.event
+async def on_guild_role_create(role):
+    # a new role may now carry the ping name
+    if _ping_role_id is None and role.name == ROLE_TO_PING:
+        _set_ping_role(role.id)
+
+
+@bot.event
+async def on_guild_role_update(before, after):
+    # the cached id survives renames; only pick up a role newly renamed to the ping name
+    if _ping_role_id is None and after.name == ROLE_TO_PING:
+        _set_ping_role(after.id)
+
+
+@bot.event
+async def on_guild_role_delete(role):
+    if role.id == _ping_role_id:
+        _set_ping_role(None)
+
+
 # -------------------------
 # Run
 # -------------------------
-bot.run(TOKEN, log_handler=handler, log_level=logging.DEBUG)
+bot.run(TOKEN, log_handler=handler, log_level=LOG_LEVEL)